@@ -28,6 +28,12 @@ use crate::events::AccessEvent;
 /// previously-denied credential. Matches `main.rs` (10 seconds).
 pub const RECHECK_DEADLINE_MS: u64 = 10_000;
 
+/// A read identical to the previous processed read that arrives within this
+/// window is treated as the reader repeating itself (common when a fob is
+/// held against it) and dropped without effects, so a lingering swipe does
+/// not pulse the door, log an event or trigger a sync a second time.
+pub const REREAD_WINDOW_MS: u64 = 1_500;
+
 /// Number of effects emitted by a single `step()` call. The current
 /// implementation emits at most 3 (Record + Feedback + OpenDoor on grant;
 /// Record + Feedback + RequestSync on denial); 4 leaves headroom.
@@ -91,6 +97,8 @@ pub struct AccessCore {
     /// Number of consecutive denials. Drives exponential backoff (1, 2, 4,
     /// then 8s thereafter). Reset to 0 on any grant.
     failed_attempts: u8,
+    /// The last card read that was processed (not dropped) and when.
+    last_read: Option<(CardRead, u64)>,
 }
 
 impl Default for AccessCore {
@@ -105,6 +113,7 @@ impl AccessCore {
             pending_recheck: None,
             backoff_until: 0,
             failed_attempts: 0,
+            last_read: None,
         }
     }
 
@@ -123,14 +132,23 @@ impl AccessCore {
         self.failed_attempts
     }
 
+    /// Read-only access to the last processed card read, for tests.
+    pub fn last_read(&self) -> Option<(CardRead, u64)> {
+        self.last_read
+    }
+
     /// Step the state machine.
     ///
     /// - `now_ms`: virtual wall clock (milliseconds).
     /// - `local_fobs`: locally-managed authorized credential IDs (from the
     ///   HTTP UI, persisted in flash). Checked first; a hit always grants
-    ///   regardless of Conway state.
+    ///   regardless of Conway state. Must be sorted ascending (the fob
+    ///   store keeps the list in id order) for the same reason as below.
     /// - `remote_fobs`: snapshot of the Conway-synced cache. Checked only
-    ///   when `local_fobs` does not contain the credential.
+    ///   when `local_fobs` does not contain the credential. Must be sorted
+    ///   ascending (the sync task sorts it before publishing) because it is
+    ///   looked up by binary search: it holds up to `MAX_FOBS` entries and
+    ///   is consulted on every swipe.
     /// - `conway_enabled`: whether a Conway host is configured. When
     ///   `false`, denials apply backoff immediately (no `RequestSync`, no
     ///   recheck window) since there is no remote authority to consult.
@@ -147,7 +165,19 @@ impl AccessCore {
     ) -> HVec<Effect, MAX_EFFECTS_PER_STEP> {
         let mut out: HVec<Effect, MAX_EFFECTS_PER_STEP> = HVec::new();
 
-        let contains = |slice: &[u32], v: u32| slice.contains(&v);
+        // Binary search on an unsorted slice silently misses entries,
+        // which here means denying valid fobs. Catch that in tests.
+        debug_assert!(
+            local_fobs.windows(2).all(|w| w[0] <= w[1]),
+            "local_fobs must be sorted"
+        );
+        debug_assert!(
+            remote_fobs.windows(2).all(|w| w[0] <= w[1]),
+            "remote_fobs must be sorted"
+        );
+
+        let in_local = |v: u32| local_fobs.binary_search(&v).is_ok();
+        let in_remote = |v: u32| remote_fobs.binary_search(&v).is_ok();
 
         match input {
             Input::WatchdogFeed => {
@@ -160,9 +190,9 @@ impl AccessCore {
                         // Recheck expired; do nothing.
                         return out;
                     }
-                    let fob_ok = contains(local_fobs, fob) || contains(remote_fobs, fob);
+                    let fob_ok = in_local(fob) || in_remote(fob);
                     let nfc_ok = !fob_ok
-                        && (contains(local_fobs, nfc) || contains(remote_fobs, nfc));
+                        && (in_local(nfc) || in_remote(nfc));
                     let allowed = fob_ok || nfc_ok;
                     if allowed {
                         // Defensively clear both failed_attempts and
@@ -201,19 +231,26 @@ impl AccessCore {
                     // Card ignored during backoff window; no effects.
                     return out;
                 }
+                if let Some((last, at)) = self.last_read {
+                    if last == read && now_ms.saturating_sub(at) < REREAD_WINDOW_MS {
+                        // Repeat of the read just handled; no effects.
+                        return out;
+                    }
+                }
+                self.last_read = Some((read, now_ms));
 
                 let fob = read.fob;
                 let nfc = read.nfc;
 
                 // Local list wins. Only consult the remote cache on a
                 // local miss; local can grant but cannot revoke remote.
-                let local_fob_ok = contains(local_fobs, fob);
-                let local_nfc_ok = !local_fob_ok && contains(local_fobs, nfc);
-                let remote_fob_ok = !local_fob_ok && !local_nfc_ok && contains(remote_fobs, fob);
+                let local_fob_ok = in_local(fob);
+                let local_nfc_ok = !local_fob_ok && in_local(nfc);
+                let remote_fob_ok = !local_fob_ok && !local_nfc_ok && in_remote(fob);
                 let remote_nfc_ok = !local_fob_ok
                     && !local_nfc_ok
                     && !remote_fob_ok
-                    && contains(remote_fobs, nfc);
+                    && in_remote(nfc);
                 let fob_ok = local_fob_ok || remote_fob_ok;
                 let nfc_ok = local_nfc_ok || remote_nfc_ok;
                 let allowed = fob_ok || nfc_ok;
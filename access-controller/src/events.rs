@@ -1,5 +1,13 @@
 //! Access event reported to the Conway server.
 
+use core::fmt::Write;
+
+use heapless::String as HString;
+
+/// Longest JSON encoding of one event:
+/// `{"fob":4294967295,"allowed":false}`.
+pub const JSON_MAX_LEN: usize = 34;
+
 /// A single swipe event: which credential was presented and whether the
 /// local cache authorized it. Buffered locally and POSTed to Conway during
 /// the next sync; only removed from the buffer after the server ACKs.
@@ -8,3 +16,21 @@ pub struct AccessEvent {
     pub fob: u32,
     pub allowed: bool,
 }
+
+impl AccessEvent {
+    /// Encode as the `{"fob":N,"allowed":B}` object `/api/fobs` expects.
+    pub fn to_json(&self) -> HString<JSON_MAX_LEN> {
+        let mut s = HString::new();
+        // Cannot fail: JSON_MAX_LEN covers the widest fob and `false`.
+        let _ = write!(s, r#"{{"fob":{},"allowed":{}}}"#, self.fob, self.allowed);
+        s
+    }
+
+    /// Length of [`Self::to_json`] without encoding it, so a caller can
+    /// send an exact `Content-Length` before streaming the events.
+    pub fn json_len(&self) -> usize {
+        // `{"fob":` + `,"allowed":` + `}` = 19 bytes around the values.
+        let digits = self.fob.checked_ilog10().unwrap_or(0) as usize + 1;
+        19 + digits + if self.allowed { 4 } else { 5 }
+    }
+}
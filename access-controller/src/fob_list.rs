@@ -0,0 +1,46 @@
+//! Parsing of the fob list Conway returns from `/api/fobs`.
+//!
+//! Lives in the pure library so the host tests can check it; the sync
+//! task in `src/sync.rs` calls it with the firmware's `MAX_FOBS`.
+
+use heapless::Vec as HVec;
+
+/// Parse the `[id,id,...]` body into a list sorted ascending, as
+/// `AccessCore::step` requires. Holds at most `N` entries.
+pub fn parse_fob_list<const N: usize>(json: &str) -> Result<HVec<u32, N>, &'static str> {
+    let trimmed = json.trim();
+    if !trimmed.starts_with('[') || !trimmed.ends_with(']') {
+        return Err("not a JSON array");
+    }
+
+    let inner = &trimmed[1..trimmed.len() - 1];
+    let mut fobs = HVec::new();
+
+    for part in inner.split(',') {
+        let part = part.trim();
+        if part.is_empty() {
+            // Tolerate `[]` and a single trailing comma so the cache
+            // doesn't get nuked by a stylistic server change. Embedded
+            // empties (e.g. `1,,2`) still parse as empty and are skipped.
+            continue;
+        }
+        // Strict: any non-empty element that does NOT parse as a bare
+        // u32 is a hard error. Previously this silently dropped the
+        // element, so a pretty-printed body or any schema evolution
+        // (e.g. `[{"id":1}, ...]`) yielded an empty list that was then
+        // committed as the live cache -> mass lockout with no signal.
+        let fob: u32 = part
+            .parse()
+            .map_err(|_| "fob list element is not a u32")?;
+        if fobs.push(fob).is_err() {
+            return Err("fob list exceeds cache capacity");
+        }
+    }
+
+    // `AccessCore` binary-searches the cache on every swipe. Conway already
+    // emits the list in `ORDER BY fob_id`, so this is a linear pass in the
+    // common case; sorting anyway keeps lookups correct if it ever doesn't.
+    fobs.sort_unstable();
+
+    Ok(fobs)
+}
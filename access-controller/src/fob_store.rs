@@ -138,6 +138,22 @@ struct Record {
     payload: alloc::vec::Vec<u8>,
 }
 
+/// Whether `a` is at least as new as `b`. The signed diff handles u64
+/// wraparound (irrelevant in practice — saves are operator-driven — but
+/// free correctness).
+fn seq_newer(a: u64, b: u64) -> bool {
+    (a.wrapping_sub(b)) as i64 >= 0
+}
+
+/// The record [`load`] returns: the newer of the slots that opened.
+fn newest<'r>(a: &'r Option<Record>, b: &'r Option<Record>) -> Option<&'r Record> {
+    match (a, b) {
+        (Some(ra), Some(rb)) => Some(if seq_newer(ra.seq, rb.seq) { ra } else { rb }),
+        (Some(r), None) | (None, Some(r)) => Some(r),
+        (None, None) => None,
+    }
+}
+
 fn read_slot(flash: &mut FlashStorage, base: u32, key: &[u8; 32]) -> Option<Record> {
     // Read header first to learn payload_len, then read the rest.
     let mut hdr = [0u8; crypto::HEADER_LEN];
@@ -168,10 +184,9 @@ fn write_slot(
     flash: &mut FlashStorage,
     base: u32,
     seq: u64,
-    fobs: &[LocalFob],
+    plaintext: &[u8],
     key: &[u8; 32],
 ) -> Result<(), &'static str> {
-    let plaintext = serialize(fobs);
     if plaintext.len() > MAX_PLAINTEXT {
         return Err("payload too large");
     }
@@ -179,16 +194,13 @@ fn write_slot(
     if total > SECTOR as usize {
         return Err("payload too large");
     }
-    if fobs.len() > u16::MAX as usize {
-        return Err("too many fobs");
-    }
 
     // Build full sector buffer so the underlying FlashStorage write is a
     // single sector-aligned erase+program. Unused tail stays 0xFF so a
     // future shorter record's read past payload_len cannot leak stale
     // ciphertext (the AEAD never reads past the declared len anyway).
     let mut buf = alloc::vec![0xFFu8; SECTOR as usize];
-    crypto::seal(key, MAGIC, seq, crypto::DOMAIN_FOBS, &plaintext, &mut buf[..total])
+    crypto::seal(key, MAGIC, seq, crypto::DOMAIN_FOBS, plaintext, &mut buf[..total])
         .map_err(|_| "crypto seal failed")?;
 
     flash.write(base, &buf).map_err(|_| "flash write failed")?;
@@ -232,46 +244,47 @@ pub fn load() -> HVec<LocalFob, MAX_LOCAL_FOBS> {
     let mut flash = FlashStorage::new();
     let a = read_slot(&mut flash, SLOTS[0], key);
     let b = read_slot(&mut flash, SLOTS[1], key);
-    let winner = match (a, b) {
-        (Some(a), Some(b)) => {
-            // Signed diff handles u64 wraparound (irrelevant in practice
-            // — saves are operator-driven — but free correctness).
-            if (a.seq.wrapping_sub(b.seq)) as i64 >= 0 {
-                a
-            } else {
-                b
-            }
-        }
-        (Some(a), None) => a,
-        (None, Some(b)) => b,
-        (None, None) => return HVec::new(),
+    let Some(winner) = newest(&a, &b) else {
+        return HVec::new();
     };
-    deserialize(&winner.payload).unwrap_or_default()
+    // `AccessCore` binary-searches the list and `http` inserts in order;
+    // records written before the list was kept sorted need a pass here.
+    let mut fobs = deserialize(&winner.payload).unwrap_or_default();
+    fobs.sort_unstable_by_key(|f| f.id);
+    fobs
 }
 
 /// Persist new fob list. Writes to the older slot, then erases the other.
-/// Returns an error if the device is not yet provisioned.
-pub fn save(fobs: &[LocalFob]) -> Result<(), &'static str> {
+/// A list identical to the one already stored is not rewritten. Returns
+/// an error if the device is not yet provisioned.
+pub async fn save(fobs: &[LocalFob]) -> Result<(), &'static str> {
     let Some(key) = device_key::fobs_key() else {
         return Err("device not provisioned (eFuse BLOCK3 unset)");
     };
+    if fobs.len() > u16::MAX as usize {
+        return Err("too many fobs");
+    }
+    let plaintext = serialize(fobs);
+
     let mut flash = FlashStorage::new();
     let a = read_slot(&mut flash, SLOTS[0], key);
     let b = read_slot(&mut flash, SLOTS[1], key);
 
-    // Pick write slot based on which successfully-opened slot is older
-    // (or use slot 0 if neither opens).
-    let write_idx: u8 = match (&a, &b) {
-        (None, None) => 0,
-        (None, Some(_)) => 0,
-        (Some(_), None) => 1,
-        (Some(ra), Some(rb)) => {
-            if (ra.seq.wrapping_sub(rb.seq)) as i64 >= 0 {
-                1
-            } else {
-                0
-            }
-        }
+    // Skip the erase+program cycle when the record `load` would return
+    // already holds exactly this payload (e.g. a rename to the same label,
+    // or a resubmitted form). Each rewrite costs two sector erases of
+    // finite flash endurance and buys nothing here.
+    let current = newest(&a, &b);
+    if current.is_some_and(|r| r.payload == plaintext) {
+        log::debug!("fob_store: list unchanged, skipping write");
+        return Ok(());
+    }
+
+    // Overwrite the slot that does not hold the current record (slot 0
+    // if neither opens), so an interrupted write leaves it loadable.
+    let write_idx: u8 = match (current, &a) {
+        (Some(c), Some(ra)) if core::ptr::eq(c, ra) => 1,
+        _ => 0,
     };
 
     // Compute next_seq from ANY parseable header (open success not
@@ -280,13 +293,17 @@ pub fn save(fobs: &[LocalFob]) -> Result<(), &'static str> {
     let seq_a = peek_slot_seq(&mut flash, SLOTS[0]);
     let seq_b = peek_slot_seq(&mut flash, SLOTS[1]);
     let max_hdr_seq = match (seq_a, seq_b) {
-        (Some(x), Some(y)) => Some(if (x.wrapping_sub(y)) as i64 >= 0 { x } else { y }),
+        (Some(x), Some(y)) => Some(if seq_newer(x, y) { x } else { y }),
         (Some(x), None) | (None, Some(x)) => Some(x),
         (None, None) => None,
     };
     let next_seq = max_hdr_seq.map(|s| s.wrapping_add(1)).unwrap_or(1u64);
 
-    write_slot(&mut flash, SLOTS[write_idx as usize], next_seq, fobs, key)?;
+    write_slot(&mut flash, SLOTS[write_idx as usize], next_seq, &plaintext, key)?;
+    // Each sector erase + program blocks the executor; give the reader
+    // and access tasks a turn between the two rather than stalling them
+    // for both back to back.
+    embassy_futures::yield_now().await;
     let other = (1 - write_idx) as usize;
     let _ = erase_slot(&mut flash, SLOTS[other]);
 
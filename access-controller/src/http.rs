@@ -444,6 +444,58 @@ async fn send_swipes_page(socket: &mut TcpSocket<'_>) {
     }
     send_text(socket, "200 OK", body.as_bytes()).await;
 }
+
+/// Static opening of the status page: styles, title and nav. Sent as-is;
+/// only the table in the middle is formatted per request.
+const STATUS_PAGE_HEAD: &str = concat!(
+    "<!doctype html>\
+<html><head><meta charset=\"utf-8\"><title>Conway Access Controller</title>\
+<style>body{font-family:system-ui,sans-serif;margin:2rem;max-width:40rem}\
+h1{margin-bottom:0}h2{margin-top:2rem}table{border-collapse:collapse;margin-top:1rem}\
+th,td{text-align:left;padding:.25rem .75rem;border-bottom:1px solid #ddd}\
+th{background:#f3f3f3}progress{width:100%}\
+.err{color:#b00}.ok{color:#070}</style></head><body>\
+<h1>Conway Access Controller</h1>\
+<p>Firmware v",
+    env!("CARGO_PKG_VERSION"),
+    " &middot; <a href=\"/config\">Configuration</a> &middot; <a href=\"/fobs\">Local fobs</a> &middot; <a href=\"/swipes\">Swipe log</a></p>"
+);
+
+/// Static close of the status page: the OTA form and the page script.
+const STATUS_PAGE_TAIL: &str = "<form id=\"otaform\">\
+<input type=\"file\" id=\"otafile\" accept=\".bin\" required>\
+<button type=\"submit\">Upload</button>\
+</form>\
+<p><progress id=\"otaprog\" value=\"0\" max=\"100\"></progress></p>\
+<p id=\"otastatus\"></p>\
+<p><button id=\"rollbackbtn\">Roll back to previous slot</button></p>\
+<script>\
+const f=document.getElementById('otaform'),fi=document.getElementById('otafile'),\
+p=document.getElementById('otaprog'),s=document.getElementById('otastatus'),\
+rb=document.getElementById('rollbackbtn'),\
+ub=document.getElementById('unlockbtn'),\
+us=document.getElementById('unlockstatus');\
+f.addEventListener('submit',e=>{e.preventDefault();const file=fi.files[0];if(!file)return;\
+s.textContent='Uploading '+file.size+' bytes...';s.className='';\
+const x=new XMLHttpRequest();x.open('POST','/ota');\
+x.setRequestHeader('Content-Type','application/octet-stream');\
+x.upload.onprogress=ev=>{if(ev.lengthComputable)p.value=ev.loaded/ev.total*100;};\
+x.onload=()=>{s.textContent=x.responseText||('status '+x.status);\
+s.className=x.status===200?'ok':'err';};\
+x.onerror=()=>{s.textContent='upload failed';s.className='err';};\
+x.send(file);});\
+rb.addEventListener('click',()=>{if(!confirm('Roll back and reboot?'))return;\
+fetch('/ota/rollback',{method:'POST'}).then(r=>r.text()).then(t=>{s.textContent=t;})\
+.catch(e=>{s.textContent='rollback failed';s.className='err';});});\
+if(ub){ub.addEventListener('click',()=>{if(!confirm('Unlock the door now?'))return;\
+us.textContent='unlocking...';us.className='';\
+fetch('/unlock',{method:'POST'}).then(r=>r.text().then(t=>{\
+us.textContent=t.trim();us.className=r.ok?'ok':'err';\
+if(r.ok)setTimeout(()=>location.reload(),800);}))\
+.catch(e=>{us.textContent='unlock failed';us.className='err';});});}\
+</script>\
+</body></html>";
+
 async fn send_status_page(
     socket: &mut TcpSocket<'_>,
     fobs: &Mutex<CriticalSectionRawMutex, heapless::Vec<u32, MAX_FOBS>>,
@@ -502,8 +554,6 @@ async fn send_status_page(
         let _ = ip_str.push_str("n/a");
     }
 
-    let firmware = env!("CARGO_PKG_VERSION");
-
     // OTA status. If the partition layout is missing we just show a
     // dash instead of failing the whole page.
     let mut ota_str: HString<48> = HString::new();
@@ -634,21 +684,13 @@ async fn send_status_page(
         let _ = conway_row.push_str(conway_host_str.as_str()); // already "(standalone)"
     }
 
-    // Build body. 5 KiB is plenty for this page including the upload
-    // form, last-swipe row, and unlock button.
-    let mut body: HString<5120> = HString::new();
+    // Format only the dynamic middle of the page; the static head and the
+    // OTA form + script around it are sent straight from flash. 3 KiB
+    // covers a full banner plus the table.
+    let mut body: HString<3072> = HString::new();
     let _ = write!(
         body,
-        "<!doctype html>\
-<html><head><meta charset=\"utf-8\"><title>Conway Access Controller</title>\
-<style>body{{font-family:system-ui,sans-serif;margin:2rem;max-width:40rem}}\
-h1{{margin-bottom:0}}h2{{margin-top:2rem}}table{{border-collapse:collapse;margin-top:1rem}}\
-th,td{{text-align:left;padding:.25rem .75rem;border-bottom:1px solid #ddd}}\
-th{{background:#f3f3f3}}progress{{width:100%}}\
-.err{{color:#b00}}.ok{{color:#070}}</style></head><body>\
-<h1>Conway Access Controller</h1>\
-<p>Firmware v{firmware} &middot; <a href=\"/config\">Configuration</a> &middot; <a href=\"/fobs\">Local fobs</a> &middot; <a href=\"/swipes\">Swipe log</a></p>\
-{banner}\
+        "{banner}\
 <table>\
 <tr><th>Uptime</th><td>{uptime} s</td></tr>\
 <tr><th>WiFi SSID</th><td>{ssid}</td></tr>\
@@ -664,41 +706,7 @@ th{{background:#f3f3f3}}progress{{width:100%}}\
 {unlock_section}\
 <h2>Firmware update</h2>\
 <p>Max image size: {maxk} KiB. The device will reboot into the new \
-image on success.</p>\
-<form id=\"otaform\">\
-<input type=\"file\" id=\"otafile\" accept=\".bin\" required>\
-<button type=\"submit\">Upload</button>\
-</form>\
-<p><progress id=\"otaprog\" value=\"0\" max=\"100\"></progress></p>\
-<p id=\"otastatus\"></p>\
-<p><button id=\"rollbackbtn\">Roll back to previous slot</button></p>\
-<script>\
-const f=document.getElementById('otaform'),fi=document.getElementById('otafile'),\
-p=document.getElementById('otaprog'),s=document.getElementById('otastatus'),\
-rb=document.getElementById('rollbackbtn'),\
-ub=document.getElementById('unlockbtn'),\
-us=document.getElementById('unlockstatus');\
-f.addEventListener('submit',e=>{{e.preventDefault();const file=fi.files[0];if(!file)return;\
-s.textContent='Uploading '+file.size+' bytes...';s.className='';\
-const x=new XMLHttpRequest();x.open('POST','/ota');\
-x.setRequestHeader('Content-Type','application/octet-stream');\
-x.upload.onprogress=ev=>{{if(ev.lengthComputable)p.value=ev.loaded/ev.total*100;}};\
-x.onload=()=>{{s.textContent=x.responseText||('status '+x.status);\
-s.className=x.status===200?'ok':'err';}};\
-x.onerror=()=>{{s.textContent='upload failed';s.className='err';}};\
-x.send(file);}});\
-rb.addEventListener('click',()=>{{if(!confirm('Roll back and reboot?'))return;\
-fetch('/ota/rollback',{{method:'POST'}}).then(r=>r.text()).then(t=>{{s.textContent=t;}})\
-.catch(e=>{{s.textContent='rollback failed';s.className='err';}});}});\
-if(ub){{ub.addEventListener('click',()=>{{if(!confirm('Unlock the door now?'))return;\
-us.textContent='unlocking...';us.className='';\
-fetch('/unlock',{{method:'POST'}}).then(r=>r.text().then(t=>{{\
-us.textContent=t.trim();us.className=r.ok?'ok':'err';\
-if(r.ok)setTimeout(()=>location.reload(),800);}}))\
-.catch(e=>{{us.textContent='unlock failed';us.className='err';}});}});}}\
-</script>\
-</body></html>",
-        firmware = firmware,
+image on success.</p>",
         banner = banner.as_str(),
         uptime = uptime_secs,
         ssid = cur_ssid.as_str(),
@@ -727,15 +735,18 @@ if(r.ok)setTimeout(()=>location.reload(),800);}}))\
          Cache-Control: no-store\r\n\
          Connection: close\r\n\
          \r\n",
-        body.len()
+        STATUS_PAGE_HEAD.len() + body.len() + STATUS_PAGE_TAIL.len()
     );
 
     if let Err(e) = socket.write_all(header.as_bytes()).await {
         log::warn!("http: write header failed: {:?}", e);
         return;
     }
-    if let Err(e) = socket.write_all(body.as_bytes()).await {
-        log::warn!("http: write body failed: {:?}", e);
+    for part in [STATUS_PAGE_HEAD, body.as_str(), STATUS_PAGE_TAIL] {
+        if let Err(e) = socket.write_all(part.as_bytes()).await {
+            log::warn!("http: write body failed: {:?}", e);
+            return;
+        }
     }
 }
 
@@ -1542,32 +1553,39 @@ async fn handle_fob_add(
         return;
     }
 
-    // Update in-memory list, then persist. We swap-replace any existing
-    // entry with the same id (so the form doubles as "rename").
+    // Update in-memory list, then persist. The list is kept sorted by id
+    // (AccessCore binary-searches it); an existing entry with the same id
+    // is relabeled in place (so the form doubles as "rename").
     let to_save: alloc::vec::Vec<LocalFob> = {
         let mut g = local_fobs.lock().await;
-        if let Some(existing) = g.iter_mut().find(|f| f.id == id) {
-            existing.label = label_hs.clone();
-        } else if g
-            .push(LocalFob {
-                id,
-                label: label_hs.clone(),
-            })
-            .is_err()
-        {
-            send_status_line(
-                socket,
-                "507 Insufficient Storage",
-                b"local fob list is full\n",
-            )
-            .await;
-            return;
+        match g.binary_search_by_key(&id, |f| f.id) {
+            Ok(i) => g[i].label = label_hs.clone(),
+            Err(i) => {
+                if g
+                    .insert(
+                        i,
+                        LocalFob {
+                            id,
+                            label: label_hs.clone(),
+                        },
+                    )
+                    .is_err()
+                {
+                    send_status_line(
+                        socket,
+                        "507 Insufficient Storage",
+                        b"local fob list is full\n",
+                    )
+                    .await;
+                    return;
+                }
+            }
         }
         g.iter().cloned().collect()
     };
 
     WATCHDOG_FEED.signal(());
-    if let Err(e) = fob_store::save(&to_save) {
+    if let Err(e) = fob_store::save(&to_save).await {
         log::error!("fobs: save failed: {}", e);
         let mut msg: HString<96> = HString::new();
         let _ = write!(msg, "save failed: {}\n", e);
@@ -1635,7 +1653,7 @@ async fn handle_fob_delete(
         log::warn!("fobs: delete id={} not found", id);
     } else {
         WATCHDOG_FEED.signal(());
-        if let Err(e) = fob_store::save(&to_save) {
+        if let Err(e) = fob_store::save(&to_save).await {
             log::error!("fobs: save failed: {}", e);
             let mut msg: HString<96> = HString::new();
             let _ = write!(msg, "save failed: {}\n", e);
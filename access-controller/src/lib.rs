@@ -18,4 +18,5 @@ pub mod core;
 pub mod crypto;
 pub mod decode;
 pub mod events;
+pub mod fob_list;
 pub mod signing;
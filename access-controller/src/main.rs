@@ -28,6 +28,7 @@ extern crate alloc;
 use alloc::boxed::Box;
 use alloc::format;
 use core::mem::MaybeUninit;
+use embassy_net::tcp::TcpSocket;
 use embassy_net::{Config as NetConfig, Stack, StackResources, StaticConfigV4};
 use embassy_sync::blocking_mutex::raw::CriticalSectionRawMutex;
 use embassy_sync::channel::Channel;
@@ -680,7 +681,9 @@ async fn access_task(
             let fob_list = fobs.lock().await;
             let local_list = local_fobs.lock().await;
             // Project LocalFob -> u32 ids into a small stack buffer so
-            // AccessCore stays oblivious to label metadata.
+            // AccessCore stays oblivious to label metadata. The store keeps
+            // the list in id order, so the ids come out sorted as `step()`
+            // requires.
             let mut local_ids: heapless::Vec<u32, MAX_LOCAL_FOBS> = heapless::Vec::new();
             for f in local_list.iter() {
                 let _ = local_ids.push(f.id);
@@ -797,6 +800,13 @@ async fn sync_task(
     }
     log::info!("sync: network ready");
 
+    // The socket and its buffers outlive each sync so the connection to
+    // Conway is kept alive between polls. Heap-allocated so we don't blow
+    // the task stack.
+    let mut rx_buf = alloc::vec![0u8; crate::sync::RX_WINDOW];
+    let mut tx_buf = alloc::vec![0u8; crate::sync::TX_WINDOW];
+    let mut socket = TcpSocket::new(*stack, &mut rx_buf, &mut tx_buf);
+
     loop {
         // Wait for periodic timer or on-demand signal
         let _ = embassy_futures::select::select(
@@ -810,7 +820,7 @@ async fn sync_task(
             continue;
         }
 
-        crate::sync::sync_with_conway(stack, fobs, etag, rt).await;
+        crate::sync::sync_with_conway(&mut socket, fobs, etag, rt).await;
     }
 }
 
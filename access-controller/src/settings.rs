@@ -237,6 +237,22 @@ struct Record {
     payload: alloc::vec::Vec<u8>,
 }
 
+/// Whether `a` is at least as new as `b`. The signed diff handles u64
+/// wraparound (irrelevant in practice — saves are operator-driven — but
+/// free correctness).
+fn seq_newer(a: u64, b: u64) -> bool {
+    (a.wrapping_sub(b)) as i64 >= 0
+}
+
+/// The record [`load`] returns: the newer of the slots that opened.
+fn newest<'r>(a: &'r Option<Record>, b: &'r Option<Record>) -> Option<&'r Record> {
+    match (a, b) {
+        (Some(ra), Some(rb)) => Some(if seq_newer(ra.seq, rb.seq) { ra } else { rb }),
+        (Some(r), None) | (None, Some(r)) => Some(r),
+        (None, None) => None,
+    }
+}
+
 fn read_slot(flash: &mut FlashStorage, base: u32, key: &[u8; 32]) -> Option<Record> {
     let mut hdr = [0u8; crypto::HEADER_LEN];
     flash.read(base, &mut hdr).ok()?;
@@ -307,43 +323,39 @@ pub fn load() -> Option<Settings> {
     let mut flash = FlashStorage::new();
     let a = read_slot(&mut flash, SLOTS[0], key);
     let b = read_slot(&mut flash, SLOTS[1], key);
-    let winner = match (a, b) {
-        (Some(a), Some(b)) => {
-            if (a.seq.wrapping_sub(b.seq)) as i64 >= 0 {
-                a
-            } else {
-                b
-            }
-        }
-        (Some(a), None) => a,
-        (None, Some(b)) => b,
-        (None, None) => return None,
-    };
+    let winner = newest(&a, &b)?;
     Settings::deserialize(&winner.payload)
 }
 
 /// Persist new settings. Writes to the older slot, then erases the other.
+/// Settings identical to the ones already stored are not rewritten.
 /// Returns an error if the device is not yet provisioned with a key.
 pub fn save(s: &Settings) -> Result<(), &'static str> {
     let Some(key) = device_key::settings_key() else {
         return Err("device not provisioned (eFuse BLOCK3 unset)");
     };
+    let mut payload = alloc::vec::Vec::with_capacity(128);
+    s.serialize(&mut payload)?;
+
     let mut flash = FlashStorage::new();
     let a = read_slot(&mut flash, SLOTS[0], key);
     let b = read_slot(&mut flash, SLOTS[1], key);
 
-    // Pick write slot from successfully-opened slots only (older one).
-    let write_idx: u8 = match (&a, &b) {
-        (None, None) => 0,
-        (None, Some(_)) => 0,
-        (Some(_), None) => 1,
-        (Some(ra), Some(rb)) => {
-            if (ra.seq.wrapping_sub(rb.seq)) as i64 >= 0 {
-                1
-            } else {
-                0
-            }
-        }
+    // Skip the erase+program cycle when the record `load` would return
+    // already holds exactly this payload, e.g. a /config form resubmitted
+    // unchanged. Each rewrite costs two sector erases of finite flash
+    // endurance.
+    let current = newest(&a, &b);
+    if current.is_some_and(|r| r.payload == payload) {
+        log::debug!("settings: unchanged, skipping write");
+        return Ok(());
+    }
+
+    // Pick write slot from successfully-opened slots only: the one not
+    // holding the current record (slot 0 if neither opens).
+    let write_idx: u8 = match (current, &a) {
+        (Some(c), Some(ra)) if core::ptr::eq(c, ra) => 1,
+        _ => 0,
     };
 
     // next_seq: max over ANY parseable header (even if AEAD open fails)
@@ -352,15 +364,12 @@ pub fn save(s: &Settings) -> Result<(), &'static str> {
     let seq_a = peek_slot_seq(&mut flash, SLOTS[0]);
     let seq_b = peek_slot_seq(&mut flash, SLOTS[1]);
     let max_hdr_seq = match (seq_a, seq_b) {
-        (Some(x), Some(y)) => Some(if (x.wrapping_sub(y)) as i64 >= 0 { x } else { y }),
+        (Some(x), Some(y)) => Some(if seq_newer(x, y) { x } else { y }),
         (Some(x), None) | (None, Some(x)) => Some(x),
         (None, None) => None,
     };
     let next_seq = max_hdr_seq.map(|s| s.wrapping_add(1)).unwrap_or(1u64);
 
-    let mut payload = alloc::vec::Vec::with_capacity(128);
-    s.serialize(&mut payload)?;
-
     write_slot(&mut flash, SLOTS[write_idx as usize], next_seq, &payload, key)?;
     let other = (1 - write_idx) as usize;
     let _ = erase_slot(&mut flash, SLOTS[other]);
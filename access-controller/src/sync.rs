@@ -8,23 +8,58 @@
 //! A bounded set of events are held in-memory.
 
 use core::fmt::Write as FmtWrite;
-use embassy_net::tcp::TcpSocket;
-use embassy_net::Stack;
+use embassy_net::tcp::{State, TcpSocket};
 use embassy_sync::blocking_mutex::raw::CriticalSectionRawMutex;
 use embassy_sync::mutex::Mutex;
-use embassy_time::Duration;
+use embassy_time::{with_timeout, Duration};
 use embedded_io_async::Write;
 use heapless::String as HString;
 use smoltcp::wire::IpAddress;
 
+use access_controller::fob_list::parse_fob_list;
+
 use crate::{EVENT_BUFFER, MAX_FOBS, RuntimeConfig, SYNC_COMPLETE};
 
 const IO_TIMEOUT: Duration = Duration::from_secs(10);
 
+/// Budget for connect + request + response, including the stale-connection
+/// retry. `IO_TIMEOUT` only fires while our own data sits unacknowledged,
+/// so a server that accepts the request and then never answers would
+/// otherwise park the sync task indefinitely. Three `IO_TIMEOUT`s leave
+/// room for a slow connect, the retry's reconnect and the response.
+const ROUNDTRIP_TIMEOUT: Duration = Duration::from_secs(30);
+
+/// Request line and headers that are identical on every sync. Host,
+/// Content-Length and If-None-Match are appended per request.
+const REQUEST_HEAD: &str = "POST /api/fobs HTTP/1.1\r\n\
+                            Content-Type: application/json\r\n\
+                            Connection: keep-alive\r\n";
+
+/// The response is accumulated into a buffer sized from MAX_FOBS: each fob
+/// serializes to up to 10 decimal digits + ',' = 11 bytes, plus '[' / ']'
+/// and ~1 KiB of HTTP response headers. With MAX_FOBS=512 this is ~7 KiB;
+/// anything smaller truncates and the cache goes stale.
+const RESPONSE_CAP: usize = MAX_FOBS * 12 + 1024;
+
+/// Receive ring for the sync socket. It only has to hold what arrives
+/// between two `read()` calls (it bounds the advertised TCP window), not
+/// the whole response. Sizing it to RESPONSE_CAP too doubled the task's
+/// peak heap use (~14 KiB of a 72 KiB heap) for no benefit.
+pub const RX_WINDOW: usize = 2048;
+
+/// Transmit ring for the sync socket.
+pub const TX_WINDOW: usize = 1024;
+
 /// Sync with Conway server using raw TCP HTTP.
 /// Events are only removed from the buffer after successful server acknowledgment.
+///
+/// `socket` is owned by `sync_task` and outlives each call, so the
+/// connection is kept alive between polls instead of paying a TCP
+/// handshake every 10 seconds. It is reconnected when it is not
+/// established, when the configured server changed, or when the previous
+/// response could not be cleanly framed; any error aborts it.
 pub async fn sync_with_conway(
-    stack: &'static Stack<'static>,
+    socket: &mut TcpSocket<'_>,
     fobs: &'static Mutex<CriticalSectionRawMutex, heapless::Vec<u32, MAX_FOBS>>,
     etag: &'static Mutex<CriticalSectionRawMutex, HString<64>>,
     rt: &'static RuntimeConfig,
@@ -44,41 +79,19 @@ pub async fn sync_with_conway(
                 // us here. Drop pending events on the floor to avoid
                 // unbounded growth.
                 log::debug!("sync: standalone mode, skipping");
+                socket.abort();
                 SYNC_COMPLETE.signal(());
                 return;
             }
         }
     };
-    let host_str = {
-        use core::fmt::Write;
-        let mut s: HString<24> = HString::new();
-        let _ = write!(
-            s,
-            "{}.{}.{}.{}",
-            host_octets[0], host_octets[1], host_octets[2], host_octets[3]
-        );
-        s
-    };
 
     // Peek at pending events without removing them from the buffer.
     // They will only be removed after the server acknowledges receipt.
     let mut events: [AccessEvent; MAX_EVENTS] = [AccessEvent::default(); MAX_EVENTS];
     let (event_count, event_tail) = EVENT_BUFFER.peek(&mut events).await;
-
-    // Build request body with events
-    let mut body: HString<512> = HString::new();
-    let _ = body.push_str("[");
-    for i in 0..event_count {
-        if i > 0 {
-            let _ = body.push_str(",");
-        }
-        let _ = write!(
-            body,
-            r#"{{"fob":{},"allowed":{}}}"#,
-            events[i].fob, events[i].allowed
-        );
-    }
-    let _ = body.push_str("]");
+    let events = &events[..event_count];
+    let body_len = events_body_len(events);
 
     // Get current ETag for If-None-Match header
     let current_etag = {
@@ -93,111 +106,102 @@ pub async fn sync_with_conway(
         host_octets[2],
         host_octets[3],
     ));
-
-    // Create TCP socket. Size buffers from MAX_FOBS: each fob serializes
-    // to up to 10 decimal digits + ',' = 11 bytes, plus '[' / ']' and
-    // ~1 KiB of HTTP response headers. With MAX_FOBS=512 this is ~7 KiB;
-    // a fixed 2 KiB buffer truncates silently and the cache goes stale.
-    // Heap-allocated so we don't blow the task stack.
-    const RESPONSE_CAP: usize = MAX_FOBS * 12 + 1024;
-    let mut rx_buf = alloc::vec![0u8; RESPONSE_CAP];
-    let mut tx_buf = alloc::vec![0u8; 1024];
-    let mut socket = TcpSocket::new(*stack, rx_buf.as_mut_slice(), tx_buf.as_mut_slice());
-    socket.set_timeout(Some(IO_TIMEOUT));
-
-    // Connect to server
     let remote = smoltcp::wire::IpEndpoint::new(remote_addr, host_port);
-    log::debug!("sync: connecting to {:?}", remote);
-
-    if let Err(e) = socket.connect(remote).await {
-        log::error!("sync: connect failed: {:?}", e);
-        socket.abort();
-        SYNC_COMPLETE.signal(());
-        return;
-    }
 
-    // Build and send HTTP request
-    let mut request: HString<512> = HString::new();
+    // Build HTTP request. Worst case is ~208 bytes: the fixed head, a
+    // 15-char dotted quad, a 3-digit length and a 64-char ETag.
+    let mut request: HString<256> = HString::new();
+    let _ = request.push_str(REQUEST_HEAD);
     let _ = write!(
         request,
-        "POST /api/fobs HTTP/1.1\r\n\
-         Host: {}\r\n\
-         Content-Type: application/json\r\n\
-         Content-Length: {}\r\n\
-         Connection: close\r\n",
-        host_str.as_str(),
-        body.len()
+        "Host: {}.{}.{}.{}\r\nContent-Length: {}\r\n",
+        host_octets[0], host_octets[1], host_octets[2], host_octets[3], body_len
     );
     if !current_etag.is_empty() {
         let _ = write!(request, "If-None-Match: {}\r\n", current_etag);
     }
     let _ = request.push_str("\r\n");
 
-    // Send request headers
-    if let Err(e) = socket.write_all(request.as_bytes()).await {
-        log::error!("sync: write headers failed: {:?}", e);
-        socket.abort();
-        SYNC_COMPLETE.signal(());
-        return;
-    }
-
-    // Send request body
-    if let Err(e) = socket.write_all(body.as_bytes()).await {
-        log::error!("sync: write body failed: {:?}", e);
-        socket.abort();
-        SYNC_COMPLETE.signal(());
-        return;
-    }
-
     // Read response. Buffer is sized for the worst-case fob list above.
     // If the server somehow sends more, treat it as a hard error: do NOT
     // replace the cache and do NOT commit events.
+    // Heap-allocated so we don't blow the task stack.
     let mut response_buf = alloc::vec![0u8; RESPONSE_CAP];
-    let mut total_read = 0;
-    let mut truncated = false;
 
-    loop {
-        match socket.read(&mut response_buf[total_read..]).await {
-            Ok(0) => break, // Connection closed
-            Ok(n) => {
-                total_read += n;
-                if total_read >= response_buf.len() {
-                    truncated = true;
-                    break;
+    // The server may have closed an idle kept-alive connection since the
+    // last sync without the FIN having been processed yet. A reused
+    // connection that fails before any of the response arrives is retried
+    // once on a fresh connection, but only when a resend cannot duplicate
+    // anything: either the socket refused the request outright, or there
+    // are no events in it. Once the request went out, the server may have
+    // stored the events and died before answering; it gives every swipe
+    // row a fresh id, so resending them would record each swipe twice.
+    // Those events stay buffered for the next sync instead, which can
+    // still duplicate them, but only when a connection dies mid-request.
+    let mut reuse = socket.state() == State::Established && socket.remote_endpoint() == Some(remote);
+    let roundtrip = async {
+        loop {
+            if !reuse {
+                socket.abort();
+                socket.set_timeout(Some(IO_TIMEOUT));
+                log::debug!("sync: connecting to {:?}", remote);
+                if let Err(e) = socket.connect(remote).await {
+                    log::error!("sync: connect failed: {:?}", e);
+                    return None;
                 }
             }
-            Err(e) => {
-                log::error!("sync: read failed: {:?}", e);
-                socket.abort();
-                SYNC_COMPLETE.signal(());
-                return;
+
+            match exchange(socket, request.as_bytes(), events, &mut response_buf).await {
+                Ok(exchanged) => return Some(exchanged),
+                Err(ExchangeError::NotSent) if reuse => {
+                    log::debug!("sync: kept-alive connection was stale, reconnecting");
+                    reuse = false;
+                }
+                Err(ExchangeError::NoResponse) if reuse && events.is_empty() => {
+                    log::debug!("sync: kept-alive connection was stale, reconnecting");
+                    reuse = false;
+                }
+                Err(e) => {
+                    log::error!("sync: {}", e.as_str());
+                    return None;
+                }
             }
         }
-    }
-
-    socket.abort();
-
-    if truncated {
-        log::error!(
-            "sync: response exceeded {} bytes, refusing to update cache",
-            RESPONSE_CAP
-        );
-        SYNC_COMPLETE.signal(());
-        return;
-    }
-
-    // Parse HTTP response
-    let response = match core::str::from_utf8(&response_buf[..total_read]) {
-        Ok(s) => s,
+    };
+    let exchanged = match with_timeout(ROUNDTRIP_TIMEOUT, roundtrip).await {
+        Ok(Some(exchanged)) => exchanged,
+        Ok(None) => {
+            socket.abort();
+            SYNC_COMPLETE.signal(());
+            return;
+        }
         Err(_) => {
-            log::error!("sync: invalid response encoding");
+            log::error!(
+                "sync: no complete response within {}s",
+                ROUNDTRIP_TIMEOUT.as_secs()
+            );
+            socket.abort();
             SYNC_COMPLETE.signal(());
             return;
         }
     };
 
-    // Parse status code
-    let status = parse_status_code(response);
+    if !exchanged.keep_alive {
+        socket.abort();
+    }
+
+    // Parse the status line and the headers we use in a single pass over
+    // the raw bytes (`exchange` already did so to frame the response; the
+    // head is a few hundred bytes). Only the header values and the body
+    // are ever UTF-8 validated; the bulk of the buffer is the body itself.
+    let response = &response_buf[..exchanged.len];
+    let Some(head) = parse_response_head(response) else {
+        log::error!("sync: malformed response (no header terminator)");
+        socket.abort();
+        SYNC_COMPLETE.signal(());
+        return;
+    };
+    let status = head.status;
     log::debug!("sync: status {}", status);
 
     match status {
@@ -207,17 +211,13 @@ pub async fn sync_with_conway(
             EVENT_BUFFER.commit(event_count, event_tail).await;
         }
         200 => {
-            // Extract ETag from headers
-            let new_etag = extract_header(response, "etag");
+            let new_etag = head.etag;
             // X-Fob-Signature must be present and verify against the
             // body bytes whenever the device has been provisioned with
             // a trusted_pubkey. Until a key is configured, the header
             // is ignored — see RFC in `signing.rs` module docs.
-            let sig_header = extract_header(response, "x-fob-signature");
-
-            // Find body (after \r\n\r\n)
-            let body_start = response.find("\r\n\r\n").map(|i| i + 4);
-            let response_body = body_start.map(|i| &response[i..]).unwrap_or("");
+            let sig_header = head.signature;
+            let response_body = &response[head.body_start..];
 
             // Signature gate: must come BEFORE we replace the cache or
             // commit events. A failed verify is treated identically to
@@ -234,7 +234,7 @@ pub async fn sync_with_conway(
                         return;
                     }
                 };
-                if !access_controller::signing::verify(pk, response_body.as_bytes(), sig) {
+                if !access_controller::signing::verify(pk, response_body, sig) {
                     log::error!(
                         "sync: X-Fob-Signature failed to verify against trusted_pubkey; refusing update"
                     );
@@ -245,7 +245,12 @@ pub async fn sync_with_conway(
             }
 
             // Parse fob list
-            let new_fobs = match parse_fob_list(response_body) {
+            let Ok(response_body) = core::str::from_utf8(response_body) else {
+                log::error!("sync: invalid response encoding");
+                SYNC_COMPLETE.signal(());
+                return;
+            };
+            let new_fobs = match parse_fob_list::<MAX_FOBS>(response_body) {
                 Ok(f) => f,
                 Err(e) => {
                     log::error!("sync: {}", e);
@@ -286,30 +291,220 @@ pub async fn sync_with_conway(
     SYNC_COMPLETE.signal(());
 }
 
-/// Parse HTTP status code from response.
-fn parse_status_code(response: &str) -> u16 {
-    // Format: "HTTP/1.1 200 OK\r\n..."
-    response
-        .lines()
-        .next()
-        .and_then(|line| line.split_whitespace().nth(1))
-        .and_then(|code| code.parse().ok())
-        .unwrap_or(0)
+/// Exact byte length of the JSON array [`write_events_body`] sends.
+fn events_body_len(events: &[AccessEvent]) -> usize {
+    let commas = events.len().saturating_sub(1);
+    2 + commas + events.iter().map(AccessEvent::json_len).sum::<usize>()
+}
+
+/// Stream `events` to the socket as a JSON array, one encoded event at a
+/// time. A full buffer of wide fob IDs is ~700 bytes, so assembling the
+/// array in a fixed string first either wastes stack or (as the old
+/// 512-byte body did) silently truncates it into invalid JSON that the
+/// server rejects, wedging the events in the buffer forever.
+async fn write_events_body(
+    socket: &mut TcpSocket<'_>,
+    events: &[AccessEvent],
+) -> Result<(), embassy_net::tcp::Error> {
+    socket.write_all(b"[").await?;
+    for (i, ev) in events.iter().enumerate() {
+        if i > 0 {
+            socket.write_all(b",").await?;
+        }
+        socket.write_all(ev.to_json().as_bytes()).await?;
+    }
+    socket.write_all(b"]").await
+}
+
+/// A complete response sitting in the caller's buffer.
+struct Exchanged {
+    /// Bytes of the buffer holding the response, head and body.
+    len: usize,
+    /// Whether the connection can carry the next sync's request.
+    keep_alive: bool,
+}
+
+enum ExchangeError {
+    /// The socket refused the request, so the server never received all
+    /// of it and cannot have acted on it. On a reused connection this is a
+    /// server-side idle close that had already been processed, and the
+    /// caller retries once.
+    NotSent,
+    /// The request was sent but the connection ended before any of the
+    /// response arrived. The server may or may not have acted on it.
+    NoResponse,
+    /// The connection failed or closed part-way through the response.
+    Truncated,
+    /// The response did not fit in the buffer.
+    TooLarge,
+    /// The response is chunked, or neither has a length nor ends with the
+    /// connection, so where it ends cannot be known.
+    Unframed,
 }
 
-/// Extract header value (case-insensitive).
-fn extract_header<'a>(response: &'a str, name: &str) -> Option<&'a str> {
-    for line in response.lines() {
-        if line.is_empty() || line == "\r" {
-            break; // End of headers
+impl ExchangeError {
+    fn as_str(&self) -> &'static str {
+        match self {
+            Self::NotSent => "could not send request",
+            Self::NoResponse => "no response from server",
+            Self::Truncated => "connection lost mid-response",
+            Self::TooLarge => "response exceeded buffer, refusing to update cache",
+            Self::Unframed => "response has no usable length (chunked or unframed)",
         }
-        if let Some((key, value)) = line.split_once(':') {
-            if key.trim().eq_ignore_ascii_case(name) {
-                return Some(value.trim());
+    }
+}
+
+/// Send one request and read exactly one response into `buf`.
+///
+/// The response is framed by its `Content-Length` (a 204 or 304 has no
+/// body), which leaves a kept-alive connection ready for the next request.
+/// A response without a length is only read until the server closes the
+/// connection when it said `Connection: close`. A chunked response, or one
+/// with no length on a kept-alive connection, fails as soon as its head
+/// arrives rather than idling until the round-trip timeout.
+async fn exchange(
+    socket: &mut TcpSocket<'_>,
+    request: &[u8],
+    events: &[AccessEvent],
+    buf: &mut [u8],
+) -> Result<Exchanged, ExchangeError> {
+    if let Err(e) = socket.write_all(request).await {
+        log::debug!("sync: write headers failed: {:?}", e);
+        return Err(ExchangeError::NotSent);
+    }
+    if let Err(e) = write_events_body(socket, events).await {
+        log::debug!("sync: write body failed: {:?}", e);
+        return Err(ExchangeError::NotSent);
+    }
+
+    let mut total = 0;
+    let mut head_seen = false;
+    // Length of the whole response once the head has been parsed. Stays
+    // `None` for a `Connection: close` response delimited by the close.
+    let mut framed_len: Option<usize> = None;
+    let mut keep_alive = false;
+
+    loop {
+        if let Some(end) = framed_len {
+            if total >= end {
+                // Anything past `end` would be the start of a response we
+                // never asked for; don't reuse a connection in that state.
+                return Ok(Exchanged {
+                    len: end,
+                    keep_alive: keep_alive && total == end,
+                });
+            }
+        }
+        if total >= buf.len() {
+            return Err(ExchangeError::TooLarge);
+        }
+
+        match socket.read(&mut buf[total..]).await {
+            Ok(0) if total == 0 => return Err(ExchangeError::NoResponse),
+            Ok(0) if head_seen && framed_len.is_none() => {
+                return Ok(Exchanged {
+                    len: total,
+                    keep_alive: false,
+                });
+            }
+            Ok(0) => return Err(ExchangeError::Truncated),
+            Ok(n) => total += n,
+            Err(e) => {
+                log::debug!("sync: read failed: {:?}", e);
+                return Err(if total == 0 {
+                    ExchangeError::NoResponse
+                } else {
+                    ExchangeError::Truncated
+                });
+            }
+        }
+
+        if !head_seen {
+            if let Some(head) = parse_response_head(&buf[..total]) {
+                head_seen = true;
+                keep_alive = !head.close;
+                let body_len = match head.status {
+                    204 | 304 => Some(0),
+                    _ if head.transfer_encoding => return Err(ExchangeError::Unframed),
+                    _ => head.content_length,
+                };
+                if body_len.is_none() && !head.close {
+                    return Err(ExchangeError::Unframed);
+                }
+                framed_len = body_len.map(|l| head.body_start.saturating_add(l));
+                // A declared length that cannot fit is known to fail now;
+                // don't wait for the rest of it to trickle in first.
+                if framed_len.is_some_and(|end| end > buf.len()) {
+                    return Err(ExchangeError::TooLarge);
+                }
             }
         }
     }
-    None
+}
+
+/// Status line plus the response headers sync cares about.
+struct ResponseHead<'a> {
+    status: u16,
+    etag: Option<&'a str>,
+    signature: Option<&'a str>,
+    content_length: Option<usize>,
+    /// The server sent a `Transfer-Encoding` (in practice `chunked`).
+    transfer_encoding: bool,
+    /// The server sent `Connection: close`.
+    close: bool,
+    /// Index of the first body byte (just past the blank line).
+    body_start: usize,
+}
+
+/// Parse `HTTP/1.1 200 OK\r\n<headers>\r\n\r\n` in one pass over the
+/// header block. Header names match case-insensitively; the first
+/// occurrence of each wins (`Connection: close` anywhere wins). Returns
+/// `None` if the header block is not terminated. A malformed status line
+/// yields status 0.
+fn parse_response_head(response: &[u8]) -> Option<ResponseHead<'_>> {
+    let head_len = response.windows(4).position(|w| w == b"\r\n\r\n")?;
+    let mut lines = response[..head_len].split(|&b| b == b'\n');
+
+    let status = lines
+        .next()
+        .and_then(|line| line.split(|&b| b == b' ').nth(1))
+        .and_then(|code| core::str::from_utf8(code).ok())
+        .and_then(|code| code.trim().parse().ok())
+        .unwrap_or(0);
+
+    let mut etag = None;
+    let mut signature = None;
+    let mut content_length = None;
+    let mut transfer_encoding = false;
+    let mut close = false;
+    for line in lines {
+        let Some(colon) = line.iter().position(|&b| b == b':') else {
+            continue;
+        };
+        let name = line[..colon].trim_ascii();
+        let value = || core::str::from_utf8(line[colon + 1..].trim_ascii()).ok();
+        if name.eq_ignore_ascii_case(b"etag") {
+            etag = etag.or_else(value);
+        } else if name.eq_ignore_ascii_case(b"x-fob-signature") {
+            signature = signature.or_else(value);
+        } else if name.eq_ignore_ascii_case(b"content-length") {
+            content_length = content_length.or_else(|| value()?.parse().ok());
+        } else if name.eq_ignore_ascii_case(b"transfer-encoding") {
+            transfer_encoding = true;
+        } else if name.eq_ignore_ascii_case(b"connection") {
+            close |= value().is_some_and(|v| v.eq_ignore_ascii_case("close"));
+        }
+    }
+
+    Some(ResponseHead {
+        status,
+        etag,
+        signature,
+        content_length,
+        transfer_encoding,
+        close,
+        body_start: head_len + 4,
+    })
 }
 
 /// Parse IPv4 address string. Currently unused inside this module but
@@ -336,39 +531,6 @@ fn parse_ipv4(s: &str) -> Option<smoltcp::wire::Ipv4Address> {
     }
 }
 
-fn parse_fob_list(json: &str) -> Result<heapless::Vec<u32, MAX_FOBS>, &'static str> {
-    let trimmed = json.trim();
-    if !trimmed.starts_with('[') || !trimmed.ends_with(']') {
-        return Err("not a JSON array");
-    }
-
-    let inner = &trimmed[1..trimmed.len() - 1];
-    let mut fobs = heapless::Vec::new();
-
-    for part in inner.split(',') {
-        let part = part.trim();
-        if part.is_empty() {
-            // Tolerate `[]` and a single trailing comma so the cache
-            // doesn't get nuked by a stylistic server change. Embedded
-            // empties (e.g. `1,,2`) still parse as empty and are skipped.
-            continue;
-        }
-        // Strict: any non-empty element that does NOT parse as a bare
-        // u32 is a hard error. Previously this silently dropped the
-        // element, so a pretty-printed body or any schema evolution
-        // (e.g. `[{"id":1}, ...]`) yielded an empty list that was then
-        // committed as the live cache -> mass lockout with no signal.
-        let fob: u32 = part
-            .parse()
-            .map_err(|_| "fob list element is not a u32")?;
-        if fobs.push(fob).is_err() {
-            return Err("fob list exceeds MAX_FOBS");
-        }
-    }
-
-    Ok(fobs)
-}
-
 pub const MAX_EVENTS: usize = 20;
 
 /// Re-export so existing `use crate::sync::AccessEvent` call sites keep
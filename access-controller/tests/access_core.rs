@@ -20,7 +20,7 @@
 #![cfg(feature = "sim")]
 
 use access_controller::core::{
-    AccessCore, CardRead, Effect, Input, Outcome, RECHECK_DEADLINE_MS,
+    AccessCore, CardRead, Effect, Input, Outcome, RECHECK_DEADLINE_MS, REREAD_WINDOW_MS,
 };
 use access_controller::events::AccessEvent;
 use proptest::prelude::*;
@@ -59,9 +59,11 @@ impl Sim {
         s
     }
 
+    /// Keeps `fobs` sorted, matching the invariant `sync` upholds for the
+    /// firmware's Conway cache (`step()` binary-searches it).
     fn add_fob(&mut self, f: u32) {
-        if !self.fobs.contains(&f) {
-            self.fobs.push(f);
+        if let Err(i) = self.fobs.binary_search(&f) {
+            self.fobs.insert(i, f);
         }
     }
 
@@ -69,9 +71,11 @@ impl Sim {
         self.fobs.retain(|&x| x != f);
     }
 
+    /// Keeps `local_fobs` sorted, matching the id order the fob store
+    /// maintains for the firmware's local list.
     fn add_local_fob(&mut self, f: u32) {
-        if !self.local_fobs.contains(&f) {
-            self.local_fobs.push(f);
+        if let Err(i) = self.local_fobs.binary_search(&f) {
+            self.local_fobs.insert(i, f);
         }
     }
 
@@ -328,6 +332,55 @@ fn grant_after_sync_resets_failed_attempts() {
         "grant-after-sync must clear backoff_until alongside failed_attempts");
 }
 
+// ---------------------------------------------------------------------------
+// Reread coalescing
+// ---------------------------------------------------------------------------
+
+#[test]
+fn reread_within_window_is_dropped_after_grant() {
+    let mut s = Sim::new();
+    s.add_fob(100);
+    assert!(contains_open_door(&s.card(100, 200)));
+    s.tick(REREAD_WINDOW_MS - 1);
+    let eff = s.card(100, 200);
+    assert!(eff.is_empty(), "reread inside the window must be silent: {:?}", eff);
+}
+
+#[test]
+fn reread_within_window_is_dropped_after_denial() {
+    let mut s = Sim::new();
+    s.card(100, 200); // denied, recheck armed
+    let pending = s.core.pending_recheck();
+    s.tick(300);
+    let eff = s.card(100, 200);
+    assert!(eff.is_empty(), "reread must not re-request a sync: {:?}", eff);
+    assert_eq!(s.core.pending_recheck(), pending,
+        "a dropped reread must not re-arm the recheck window");
+}
+
+#[test]
+fn reread_window_is_measured_from_the_processed_read() {
+    let mut s = Sim::new();
+    s.add_fob(100);
+    s.card(100, 200);
+    // Repeats inside the window do not extend it.
+    s.tick(1_000);
+    assert!(s.card(100, 200).is_empty());
+    s.tick(REREAD_WINDOW_MS - 1_000);
+    assert!(contains_open_door(&s.card(100, 200)),
+        "read at the window boundary must be processed");
+}
+
+#[test]
+fn different_card_within_window_is_processed() {
+    let mut s = Sim::new();
+    s.add_fob(100);
+    s.add_fob(300);
+    s.card(100, 200);
+    s.tick(10);
+    assert!(contains_open_door(&s.card(300, 400)));
+}
+
 // ---------------------------------------------------------------------------
 // WatchdogFeed sanity
 // ---------------------------------------------------------------------------
@@ -350,6 +403,43 @@ fn watchdog_feed_does_not_disturb_pending_recheck() {
         "watchdog input must not clear pending recheck");
 }
 
+// ---------------------------------------------------------------------------
+// Sorted-cache lookup
+// ---------------------------------------------------------------------------
+
+#[test]
+fn remote_lookup_finds_every_entry_of_a_full_cache() {
+    // The remote cache is binary-searched; exercise both ends and the
+    // middle of a large sorted list, plus misses that fall between entries.
+    let mut s = Sim::new();
+    for f in (0..512u32).map(|i| 10_000_000 + i * 3) {
+        s.add_fob(f);
+    }
+    for &f in &[10_000_000, 10_000_000 + 255 * 3, 10_000_000 + 511 * 3] {
+        s.tick(10_000);
+        assert!(contains_open_door(&s.card(f, 0)), "fob {} must grant", f);
+    }
+    s.tick(10_000);
+    assert!(!contains_open_door(&s.card(10_000_001, 0)));
+}
+
+#[test]
+fn local_lookup_finds_every_entry_of_a_full_list() {
+    // The local list is binary-searched too. `add_local_fob` keeps it
+    // sorted the way `http` and `fob_store::load` do on the device, so
+    // this only pins the lookup over a full sorted list, not that order.
+    let mut s = Sim::new_standalone();
+    for f in 500..628u32 {
+        s.add_local_fob(f);
+    }
+    for f in [500, 563, 627] {
+        s.tick(10_000);
+        assert!(contains_open_door(&s.card(f, 0)), "local fob {} must grant", f);
+    }
+    s.tick(10_000);
+    assert!(!contains_open_door(&s.card(628, 0)));
+}
+
 // ---------------------------------------------------------------------------
 // Local-fob precedence + standalone-mode tests
 // ---------------------------------------------------------------------------
@@ -611,8 +701,8 @@ proptest! {
         }
     }
 
-    /// Every processed (non-backoff-dropped) `Card` input produces exactly
-    /// one `Feedback(...)` effect.
+    /// Every processed (not dropped by backoff or as a reread) `Card` input
+    /// produces exactly one `Feedback(...)` effect.
     #[test]
     fn prop_processed_card_emits_exactly_one_feedback(trace in arb_trace()) {
         let mut s = Sim::new();
@@ -623,8 +713,11 @@ proptest! {
                 Step::Card { fob, nfc, dt_ms } => {
                     s.tick(dt_ms as u64);
                     let in_backoff = s.now_ms < s.core.backoff_until();
+                    let reread = s.core.last_read().is_some_and(|(r, at)| {
+                        r == CardRead { fob, nfc } && s.now_ms - at < REREAD_WINDOW_MS
+                    });
                     let eff = s.card(fob, nfc);
-                    if !in_backoff {
+                    if !in_backoff && !reread {
                         let feedbacks = eff.iter().filter(|e| matches!(e, Effect::Feedback(_))).count();
                         prop_assert_eq!(feedbacks, 1,
                             "expected exactly 1 feedback effect, got {} in {:?}",
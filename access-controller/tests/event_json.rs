@@ -0,0 +1,54 @@
+//! Tests for the swipe-event JSON encoding uploaded to `/api/fobs`.
+//!
+//! Run with:
+//!   cargo test --no-default-features --features sim \
+//!              --target x86_64-unknown-linux-gnu \
+//!              --test event_json
+
+#![cfg(feature = "sim")]
+
+use access_controller::events::{AccessEvent, JSON_MAX_LEN};
+use proptest::prelude::*;
+
+#[test]
+fn to_json_matches_server_schema() {
+    let ev = AccessEvent { fob: 12_345_678, allowed: true };
+    assert_eq!(ev.to_json().as_str(), r#"{"fob":12345678,"allowed":true}"#);
+    let ev = AccessEvent { fob: 0, allowed: false };
+    assert_eq!(ev.to_json().as_str(), r#"{"fob":0,"allowed":false}"#);
+}
+
+#[test]
+fn widest_event_fills_json_max_len_exactly() {
+    // The manual-unlock sentinel is u32::MAX, so the widest encoding is
+    // reachable in practice and must not be truncated.
+    let ev = AccessEvent { fob: u32::MAX, allowed: false };
+    assert_eq!(ev.to_json().len(), JSON_MAX_LEN);
+    assert_eq!(ev.json_len(), JSON_MAX_LEN);
+}
+
+#[test]
+fn json_len_at_digit_boundaries() {
+    for fob in [0, 9, 10, 99, 100, 99_999, 100_000, 999_999_999, 1_000_000_000] {
+        for allowed in [false, true] {
+            let ev = AccessEvent { fob, allowed };
+            assert_eq!(ev.json_len(), ev.to_json().len(), "fob={} allowed={}", fob, allowed);
+        }
+    }
+}
+
+proptest! {
+    #![proptest_config(ProptestConfig {
+        cases: 4096,
+        rng_algorithm: proptest::test_runner::RngAlgorithm::ChaCha,
+        ..ProptestConfig::default()
+    })]
+
+    /// `json_len` is what the sync task sends as `Content-Length`; it must
+    /// agree with the bytes actually streamed for every event.
+    #[test]
+    fn prop_json_len_matches_encoding(fob in any::<u32>(), allowed in any::<bool>()) {
+        let ev = AccessEvent { fob, allowed };
+        prop_assert_eq!(ev.json_len(), ev.to_json().len());
+    }
+}
@@ -0,0 +1,67 @@
+//! Tests for parsing the `/api/fobs` fob list into the sorted cache that
+//! `AccessCore` binary-searches.
+//!
+//! Run with:
+//!   cargo test --no-default-features --features sim \
+//!              --target x86_64-unknown-linux-gnu \
+//!              --test fob_list
+
+#![cfg(feature = "sim")]
+
+use access_controller::fob_list::parse_fob_list;
+use proptest::prelude::*;
+
+#[test]
+fn parses_server_body() {
+    // Conway's encoder appends a newline after the array.
+    let fobs = parse_fob_list::<8>("[123,234]\n").unwrap();
+    assert_eq!(fobs.as_slice(), &[123, 234]);
+}
+
+#[test]
+fn sorts_an_unordered_body() {
+    let fobs = parse_fob_list::<8>("[30, 10, 4294967295, 0, 20]").unwrap();
+    assert_eq!(fobs.as_slice(), &[0, 10, 20, 30, 4_294_967_295]);
+}
+
+#[test]
+fn tolerates_empty_list_and_trailing_comma() {
+    assert!(parse_fob_list::<8>("[]").unwrap().is_empty());
+    assert_eq!(parse_fob_list::<8>("[2,1,]").unwrap().as_slice(), &[1, 2]);
+}
+
+#[test]
+fn rejects_non_array_and_non_integer_elements() {
+    assert!(parse_fob_list::<8>("{}").is_err());
+    assert!(parse_fob_list::<8>(r#"[{"id":1}]"#).is_err());
+    assert!(parse_fob_list::<8>("[1,-2]").is_err());
+}
+
+#[test]
+fn rejects_more_than_capacity() {
+    assert!(parse_fob_list::<2>("[1,2]").is_ok());
+    assert!(parse_fob_list::<2>("[1,2,3]").is_err());
+}
+
+proptest! {
+    #![proptest_config(ProptestConfig {
+        cases: 1024,
+        rng_algorithm: proptest::test_runner::RngAlgorithm::ChaCha,
+        ..ProptestConfig::default()
+    })]
+
+    /// Whatever order the server sends, every id comes back, sorted, so
+    /// a binary search finds each one.
+    #[test]
+    fn prop_any_order_parses_sorted_and_searchable(ids in proptest::collection::vec(any::<u32>(), 0..64)) {
+        let body = format!(
+            "[{}]",
+            ids.iter().map(u32::to_string).collect::<Vec<_>>().join(",")
+        );
+        let fobs = parse_fob_list::<64>(&body).unwrap();
+        prop_assert!(fobs.windows(2).all(|w| w[0] <= w[1]));
+        for id in &ids {
+            prop_assert!(fobs.binary_search(id).is_ok());
+        }
+    }
+}
@@ -16,6 +16,7 @@ import (
 	"net"
 	"net/http"
 	"net/url"
+	"strconv"
 
 	"github.com/TheLab-ms/conway/engine"
 	"github.com/TheLab-ms/conway/modules/auth"
@@ -160,6 +161,10 @@ func (m *Module) handle(w http.ResponseWriter, r *http.Request) {
 		sig := m.signer.Sign(body.Bytes())
 		w.Header().Set(SignatureHeader, base64.StdEncoding.EncodeToString(sig))
 	}
+	// Set the length explicitly. Without it net/http sends bodies larger
+	// than its 2 KiB buffer chunked, which the access-controller does not
+	// decode; it frames responses on its kept-alive connection by length.
+	w.Header().Set("Content-Length", strconv.Itoa(body.Len()))
 	w.Header().Set("ETag", etag)
 	w.Write(body.Bytes())
 }
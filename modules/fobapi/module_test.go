@@ -57,6 +57,7 @@ func TestListing(t *testing.T) {
 	assert.Equal(t, 200, w.Code)
 	assert.Equal(t, "[123,234]\n", w.Body.String())
 	assert.Equal(t, etag, w.Header().Get("ETag"))
+	assert.Equal(t, "10", w.Header().Get("Content-Length"))
 
 	// Signature header must be present and verify against the public key
 	sigB64 := w.Header().Get(SignatureHeader)